@@ -2,9 +2,7 @@ import os
 from pathlib import Path
 from typing import Any, Mapping
 
-from flask import Flask, redirect, url_for, request
-from flask_login import LoginManager
-from flask_wtf.csrf import CSRFProtect, generate_csrf
+from flask import Flask, g, redirect, url_for, request
 
 
 def create_app(config: Mapping[str, Any] | None = None) -> Flask:
@@ -24,6 +22,11 @@ def create_app(config: Mapping[str, Any] | None = None) -> Flask:
     if config:
         app.config.from_mapping(config)
 
+    app.config.setdefault(
+        "SQLALCHEMY_ENGINE_OPTIONS",
+        _engine_options(app.config["SQLALCHEMY_DATABASE_URI"]),
+    )
+
     # Production safety guard: require a strong SECRET_KEY when not running via Flask CLI
     run_from_cli = os.environ.get("FLASK_RUN_FROM_CLI", "").lower() == "true"
     if not app.debug and not run_from_cli:
@@ -40,51 +43,81 @@ def create_app(config: Mapping[str, Any] | None = None) -> Flask:
 
     # --- Database setup ---
     from . import db  # module containing init_app
-    from .db import db as sqldb  # SQLAlchemy instance
     db.init_app(app)
 
     # --- CSRF protection ---
+    from flask_wtf.csrf import CSRFProtect, generate_csrf
+
     csrf = CSRFProtect()
     csrf.init_app(app)
+    # Expose a callable csrf_token() for templates
+    app.jinja_env.globals["csrf_token"] = generate_csrf
 
     # --- Rate limiting ---
     from .limiter import limiter
     limiter.init_app(app)
 
     # --- Authentication setup ---
+    from flask_login import LoginManager
+
     login_manager = LoginManager()
     login_manager.login_view = "auth.login"
     login_manager.init_app(app)
 
-    from .models import User
-
     @login_manager.user_loader
     def load_user(user_id: str):
+        # Memoize per request; g is torn down together with the app context
+        cache = g.setdefault("_loaded_users", {})
+        if user_id in cache:
+            return cache[user_id]
+        from . import user_cache
         try:
-            return sqldb.session.get(User, int(user_id))
+            user = user_cache.load(user_id)
         except Exception:
-            return None
+            user = None
+        cache[user_id] = user
+        return user
 
-    @app.context_processor
-    def inject_csrf_token():
-        # Expose a callable csrf_token() for templates
-        return {"csrf_token": generate_csrf}
+    from .urls import static_url
 
     @login_manager.unauthorized_handler
     def _unauthorized():
         # For the root path, redirect to clean login URL without next param
         if (request.path or "/") == "/":
-            return redirect(url_for("auth.login"))
+            return redirect(static_url("auth.login"))
         # Preserve next for other endpoints
         full = request.full_path or request.path
         if full.endswith("?"):
             full = full[:-1]
         return redirect(url_for("auth.login", next=full))
 
-    # --- Blueprint registration ---
+    _register_blueprints(app)
+
+    return app
+
+
+def _engine_options(uri: str) -> dict[str, Any]:
+    """Pool settings that keep SQLite connections alive between requests."""
+    options: dict[str, Any] = {"query_cache_size": 1200}
+    if not uri.startswith("sqlite"):
+        options.update(pool_pre_ping=True, pool_recycle=1800)
+        return options
+
+    from sqlalchemy.pool import StaticPool
+
+    options["connect_args"] = {"check_same_thread": False}
+    if uri in {"sqlite://", "sqlite:///:memory:"}:
+        # A single shared connection so every session sees the same in-memory DB
+        options["poolclass"] = StaticPool
+    else:
+        # No server connection to go stale, so no pre-ping or recycling
+        options.update(pool_size=5, max_overflow=10)
+    return options
+
+
+def _register_blueprints(app: Flask) -> None:
+    """Import and register the route blueprints."""
     from .routes import swimmers, auth
 
     app.register_blueprint(swimmers.bp)
     app.register_blueprint(auth.bp)
-
-    return app
@@ -1,6 +1,7 @@
+import click
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import event
+from sqlalchemy import Integer, event, inspect
 from sqlalchemy.engine import Engine
 import sqlite3
 
@@ -17,6 +18,14 @@ def init_app(app: Flask) -> None:
         if isinstance(dbapi_connection, sqlite3.Connection):
             cur = dbapi_connection.cursor()
             cur.execute("PRAGMA foreign_keys=ON;")
+            # File-backed databases: WAL journal and relaxed fsyncs for faster writes
+            cur.execute("PRAGMA database_list;")
+            if any(row[1] == "main" and row[2] for row in cur.fetchall()):
+                cur.execute("PRAGMA journal_mode=WAL;")
+                cur.execute("PRAGMA synchronous=NORMAL;")
+                cur.execute("PRAGMA temp_store=MEMORY;")
+                cur.execute("PRAGMA cache_size=-64000;")
+                cur.execute("PRAGMA mmap_size=268435456;")
             cur.close()
 
     @app.cli.command("init-db")
@@ -27,4 +36,43 @@ def init_app(app: Flask) -> None:
 
         with app.app_context():
             db.create_all()
-        print("Initialized the database")
\ No newline at end of file
+            # create_all skips existing tables, so add indexes introduced later
+            for table in db.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(db.engine, checkfirst=True)
+            _upgrade_pb_event_codes()
+        print("Initialized the database")
+
+
+def _upgrade_pb_event_codes() -> None:
+    """Rebuild a ``pbs`` table that still stores event names as strings.
+
+    Only SQLite is converted in place; other backends must be migrated by
+    hand, so init-db refuses to continue rather than leave rows unreadable.
+    """
+    from .models import EVENT_CODES, PB
+
+    columns = {col["name"]: col["type"] for col in inspect(db.engine).get_columns("pbs")}
+    if isinstance(columns.get("event"), Integer):
+        return
+    if db.engine.dialect.name != "sqlite":
+        raise click.ClickException(
+            "pbs.event still stores event names. Convert it to the SMALLINT codes "
+            "in models.EVENT_CODES before running this version."
+        )
+
+    with db.engine.begin() as conn:
+
+        # Index names are global in SQLite: drop them before creating the new table
+        for index in PB.__table__.indexes:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index.name}")
+        conn.exec_driver_sql("ALTER TABLE pbs RENAME TO pbs_old")
+        PB.__table__.create(conn)
+
+        cases = " ".join(f"WHEN '{event.name}' THEN {code}" for event, code in EVENT_CODES.items())
+        conn.exec_driver_sql(
+            "INSERT INTO pbs (id, swimmer_id, event, points, time_seconds) "
+            f"SELECT id, swimmer_id, CASE event {cases} END, points, time_seconds FROM pbs_old"
+        )
+        conn.exec_driver_sql("DROP TABLE pbs_old")
+    print("Converted personal best events to integer codes")
\ No newline at end of file
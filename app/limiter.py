@@ -1,5 +1,13 @@
+import os
+
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
 
-limiter = Limiter(key_func=get_remote_address, storage_uri="memory://")
+# Storage is only connected in init_app; point RATELIMIT_STORAGE_URI at
+# redis:// in production so all Gunicorn workers share one set of counters.
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=os.environ.get("RATELIMIT_STORAGE_URI", "memory://"),
+    strategy="moving-window",
+)
@@ -1,14 +1,17 @@
+import hashlib
 from enum import Enum
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Mapping, Sequence
 
-from sqlalchemy import UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Index, UniqueConstraint, func, insert, select
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 from flask_login import UserMixin
 
 from .db import db
 
 
 class Event(Enum):
+    # Persisted through the fixed EVENT_CODES map below, not by position
     FR_50 = "50m Free"
     FR_100 = "100m Free"
     FR_200 = "200m Free"
@@ -29,8 +32,52 @@ class Event(Enum):
     IM_400 = "400m Medley"
 
 
+# Stored integer code per event. These values are on disk: never change or
+# reuse one, give new events the next free code.
+EVENT_CODES: Dict[Event, int] = {
+    Event.FR_50: 0,
+    Event.FR_100: 1,
+    Event.FR_200: 2,
+    Event.FR_400: 3,
+    Event.FR_800: 4,
+    Event.FR_1500: 5,
+    Event.BK_50: 6,
+    Event.BK_100: 7,
+    Event.BK_200: 8,
+    Event.BR_50: 9,
+    Event.BR_100: 10,
+    Event.BR_200: 11,
+    Event.FL_50: 12,
+    Event.FL_100: 13,
+    Event.FL_200: 14,
+    Event.IM_100: 15,
+    Event.IM_200: 16,
+    Event.IM_400: 17,
+}
+if set(EVENT_CODES) != set(Event) or len(set(EVENT_CODES.values())) != len(EVENT_CODES):
+    raise RuntimeError("EVENT_CODES must give every Event its own code.")
+_EVENTS_BY_CODE: Dict[int, Event] = {code: event for event, code in EVENT_CODES.items()}
+
+
+class EventCode(TypeDecorator):
+    """Store an Event as a small integer instead of its name string."""
+
+    impl = db.SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else EVENT_CODES[value]
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else _EVENTS_BY_CODE[value]
+
+
 class Swimmer(db.Model):
     __tablename__ = "swimmers"
+    __table_args__ = (
+        # Roster lookups filter on owner + gender + active
+        Index("ix_swimmers_owner_gender_active", "owner_id", "gender", "active"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(db.String(120), nullable=False)
@@ -58,6 +105,8 @@ class PB(db.Model):
     __tablename__ = "pbs"
     __table_args__ = (
         UniqueConstraint("swimmer_id", "event", name="uq_pb_swimmer_event"),
+        # Covering index for the optimizer's (swimmer_id, event, points) fetch
+        Index("ix_pbs_swimmer_event_points", "swimmer_id", "event", "points"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -69,8 +118,8 @@ class PB(db.Model):
     )
     swimmer: Mapped[Swimmer] = relationship(back_populates="pbs")
 
-    # Store the Python Enum name as a string in SQLite (portable)
-    event: Mapped[Event] = mapped_column(db.Enum(Event, name="event_enum", native_enum=False), nullable=False)
+    # Small-int event code (see EventCode)
+    event: Mapped[Event] = mapped_column(EventCode, nullable=False)
 
     points: Mapped[int] = mapped_column(db.Integer, nullable=False)
     time_seconds: Mapped[float | None] = mapped_column(db.Float, nullable=True)
@@ -78,14 +127,29 @@ class PB(db.Model):
     def __repr__(self) -> str:
         return f"<PB swimmer_id={self.swimmer_id} event={self.event.name} points={self.points}>"
 
-    # Helper to expose what optimizer expects
-    @staticmethod
-    def to_points_dict(swimmers: List[Swimmer]) -> Dict[Tuple[int, Event], int]:
-        out: Dict[Tuple[int, Event], int] = {}
-        for sw in swimmers:
-            for pb in (sw.pbs or []):
-                out[(sw.id, pb.event)] = pb.points
-        return out
+
+# PB count for roster rows without hydrating the PBs; deferred so plain
+# Swimmer loads skip the subquery (undefer it where the count is shown)
+Swimmer.pb_count = column_property(
+    select(func.count(PB.id))
+    .where(PB.swimmer_id == Swimmer.id)
+    .correlate_except(PB)
+    .scalar_subquery(),
+    deferred=True,
+)
+
+
+def bulk_insert_pbs(rows: Sequence[Mapping[str, Any]]) -> None:
+    """Insert many PB rows with one executemany and commit.
+
+    Each row maps PB column names (``swimmer_id``, ``event``, ``points``,
+    ``time_seconds``) to values. Use this for seeding or importing many PBs
+    rather than adding PB objects one by one.
+    """
+    if rows:
+        # Table-level insert: a single executemany regardless of NULL columns
+        db.session.execute(insert(PB.__table__), rows)
+    db.session.commit()
 
 
 class User(UserMixin, db.Model):
@@ -101,5 +165,17 @@ class User(UserMixin, db.Model):
         passive_deletes=True,
     )
 
+    @staticmethod
+    def fingerprint_for(password_hash: str) -> str:
+        return hashlib.sha256(password_hash.encode()).hexdigest()[:8]
+
+    @property
+    def session_fingerprint(self) -> str:
+        return User.fingerprint_for(self.password_hash)
+
+    def get_id(self) -> str:
+        # Session token carries a hash fingerprint so password changes invalidate it
+        return f"{self.id}:{self.session_fingerprint}"
+
     def __repr__(self) -> str:
         return f"<User id={self.id} username={self.username!r}>"
@@ -3,12 +3,13 @@ from __future__ import annotations
 
 from typing import List
 
-from flask import Blueprint, redirect, render_template, request, url_for
+from flask import Blueprint, redirect, render_template, request
 from flask_login import current_user, login_required, login_user, logout_user
-from werkzeug.security import check_password_hash, generate_password_hash
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from ..limiter import limiter
+from .. import user_cache
+from ..urls import static_url
 
 from ..db import db
 from ..models import User
@@ -16,12 +17,27 @@ from ..models import User
 
 bp = Blueprint("auth", __name__, url_prefix="")
 
+# Built once so SQLAlchemy's compiled-statement cache is hit on every lookup
+_USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+
+
+def _hash_password(password: str) -> str:
+    from werkzeug.security import generate_password_hash
+
+    return generate_password_hash(password)
+
+
+def _verify_password(password_hash: str, password: str) -> bool:
+    from werkzeug.security import check_password_hash
+
+    return check_password_hash(password_hash, password)
+
 
 @bp.route("/register", methods=["GET", "POST"])
 @limiter.limit("50/day;10/hour")  # throttle account creation by IP
 def register():
     if current_user.is_authenticated:
-        return redirect(url_for("swimmers.index"))
+        return redirect(static_url("swimmers.index"))
 
     username = request.form.get("username", "").strip()
     password = request.form.get("password", "")
@@ -39,15 +55,15 @@ def register():
             errors.append("Passwords do not match.")
 
         if not errors:
-            existing = db.session.execute(select(User).filter_by(username=username)).scalar_one_or_none()
+            existing = db.session.execute(_USER_BY_USERNAME, {"username": username}).scalar_one_or_none()
             if existing:
                 errors.append("An account with this username already exists.")
             else:
-                user = User(username=username, password_hash=generate_password_hash(password))
+                user = User(username=username, password_hash=_hash_password(password))
                 db.session.add(user)
                 db.session.commit()
                 login_user(user)
-                return redirect(url_for("swimmers.index"))
+                return redirect(static_url("swimmers.index"))
 
     return render_template("auth/register.html", username=username, errors=errors)
 
@@ -56,7 +72,7 @@ def register():
 @limiter.limit("50/hour;10/minute")  # throttle login attempts by IP
 def login():
     if current_user.is_authenticated:
-        return redirect(url_for("swimmers.index"))
+        return redirect(static_url("swimmers.index"))
 
     username = request.form.get("username", "").strip()
     password = request.form.get("password", "")
@@ -66,13 +82,13 @@ def login():
         if not username or not password:
             errors.append("Username and password are required.")
         else:
-            user = db.session.execute(select(User).filter_by(username=username)).scalar_one_or_none()
-            if not user or not check_password_hash(user.password_hash, password):
+            user = db.session.execute(_USER_BY_USERNAME, {"username": username}).scalar_one_or_none()
+            if not user or not _verify_password(user.password_hash, password):
                 errors.append("Invalid email or password.")
             else:
                 login_user(user)
                 next_url = request.args.get("next")
-                return redirect(next_url or url_for("swimmers.index"))
+                return redirect(next_url or static_url("swimmers.index"))
 
     return render_template("auth/login.html", username=username, errors=errors)
 
@@ -81,7 +97,7 @@ def login():
 @login_required
 def logout():
     logout_user()
-    return redirect(url_for("auth.login"))
+    return redirect(static_url("auth.login"))
 
 
 @bp.route("/account", methods=["GET"])
@@ -101,9 +117,16 @@ def change_password():
     new = request.form.get("new_password", "")
     confirm = request.form.get("confirm_password", "")
 
+    # Verify and write against the row as it is now, not a session-cached copy:
+    # another worker may have changed the password since this session loaded
+    user = db.session.get(User, current_user.id, populate_existing=True)
+
+    if user is None:
+        logout_user()
+        return redirect(static_url("auth.login"))
     if not current or not new or not confirm:
         errors.append("All password fields are required.")
-    elif not check_password_hash(current_user.password_hash, current):
+    elif not _verify_password(user.password_hash, current):
         errors.append("Current password is incorrect.")
     elif len(new) < 8:
         errors.append("New password must be at least 8 characters.")
@@ -111,8 +134,11 @@ def change_password():
         errors.append("New passwords do not match.")
 
     if not errors:
-        current_user.password_hash = generate_password_hash(new)
+        user.password_hash = _hash_password(new)
         db.session.commit()
+        user_cache.forget(user.id)
+        # Re-issue the session token for the new password fingerprint
+        login_user(user)
         messages.append("Password updated.")
 
     return render_template("auth/account.html", errors=errors, messages=messages)
@@ -123,9 +149,10 @@ def change_password():
 # @limiter.limit("3/hour")
 def delete_account():
     # Delete user and cascade to swimmers/PBs via FK ondelete=CASCADE
-    user = db.session.get(User, current_user.id)
+    user = db.session.get(User, current_user.id, populate_existing=True)
     logout_user()
     if user is not None:
+        user_cache.forget(user.id)
         db.session.delete(user)
         db.session.commit()
-    return redirect(url_for("auth.login"))
+    return redirect(static_url("auth.login"))
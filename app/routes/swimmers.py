@@ -1,5 +1,8 @@
 """Blueprint handling swimmer CRUD views."""
-from typing import Any, Dict
+from collections import Counter
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any, Dict, Sequence
 
 from flask import (
     Blueprint,
@@ -10,47 +13,81 @@ from flask import (
     request,
     url_for,
 )
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import delete as sql_delete, insert, select, update
+from sqlalchemy.orm import selectinload, undefer
 from flask_login import login_required, current_user
 
 from ..db import db
-from ..models import Event, PB, Swimmer
+from ..models import EVENT_CODES, Event, PB, Swimmer, bulk_insert_pbs
 from ..services import optimizer
-from ..services import swimrankings
-import re
+from ..urls import static_url
 
 bp = Blueprint("swimmers", __name__, url_prefix="")
 
 COMPETITION_OPTIONS: list[str] = ["Allgemeine Kategorie", "Nachwuchs"]
 
+# Enum .name goes through a descriptor; look the form keys up once
+_EVENT_NAMES: dict[Event, str] = {event: event.name for event in Event}
+
+# PB form state: two flat maps keyed by event name, (points, times)
+PBForm = tuple[Dict[str, str], Dict[str, str]]
+
+
+@lru_cache(maxsize=2)
+def _events_for(gender: str) -> tuple[Event, ...]:
+    """Events offered to a roster: women swim the 800m free, men the 1500m."""
+    excluded = Event.FR_1500 if gender == "f" else Event.FR_800
+    return tuple(event for event in Event if event != excluded)
+
+
+@lru_cache(maxsize=2)
+def _allowed_mask_for(gender: str) -> int:
+    """Bitmask of the roster's events, one bit per EVENT_CODES value."""
+    mask = 0
+    for event in _events_for(gender):
+        mask |= 1 << EVENT_CODES[event]
+    return mask
+
 
 def _is_htmx(req: Any) -> bool:
     """Return True when the incoming request originated from HTMX."""
     return req.headers.get("HX-Request") == "true"
 
 
-def _get_swimmer_or_404(swimmer_id: int) -> Swimmer:
-    swimmer = db.session.get(Swimmer, swimmer_id)
+def _get_swimmer_or_404(swimmer_id: int, load_pbs: bool = False) -> Swimmer:
+    # Ownership is part of the lookup: someone else's swimmer is never loaded
+    stmt = select(Swimmer).where(Swimmer.id == swimmer_id, Swimmer.owner_id == current_user.id)
+    if load_pbs:
+        stmt = stmt.options(selectinload(Swimmer.pbs))
+    swimmer = db.session.scalar(stmt)
     if swimmer is None:
         abort(404)
-    if swimmer.owner_id != getattr(current_user, "id", None):
-        abort(404)
     return swimmer
 
 
-def _empty_pb_form(events: list[Event]) -> Dict[str, Dict[str, str]]:
-    return {event.name: {"points": "", "time": ""} for event in events}
+def _empty_pb_form(events: Sequence[Event]) -> PBForm:
+    names = [_EVENT_NAMES[event] for event in events]
+    return dict.fromkeys(names, ""), dict.fromkeys(names, "")
 
 
-def _extract_pb_inputs(events: list[Event], form: Any) -> Dict[str, Dict[str, str]]:
-    data: Dict[str, Dict[str, str]] = {}
-    for event in events:
-        data[event.name] = {
-            "points": form.get(f"points_{event.name}", "").strip(),
-            "time": form.get(f"time_{event.name}", "").strip(),
-        }
-    return data
+def _extract_pb_inputs(events: Sequence[Event], form: Any) -> PBForm:
+    points, times = _empty_pb_form(events)
+    # One pass over the submitted fields, dispatching on the key prefix
+    for key, value in form.items():
+        field, _, name = key.partition("_")
+        if field == "points":
+            target = points
+        elif field == "time":
+            target = times
+        else:
+            continue
+        if not value or name not in target:
+            continue
+        # HTML inputs rarely carry padding; only strip when an end is blank
+        if value[0].isspace() or value[-1].isspace():
+            value = value.strip()
+        target[name] = value
+    return points, times
 
 
 def _coerce_int(value: str) -> int | None:
@@ -62,10 +99,6 @@ def _coerce_int(value: str) -> int | None:
         raise ValueError(f"Invalid points value: {value}") from exc
 
 
-_MINUTE_PATTERN = re.compile(r"^(\d+):([0-5]\d)\.(\d{2})$")
-_SECOND_PATTERN = re.compile(r"^(\d+)\.(\d{2})$")
-
-
 def parse_time_to_seconds(value: str | None) -> float | None:
     """Convert a time string into seconds or return None for blank input.
 
@@ -79,22 +112,27 @@ def parse_time_to_seconds(value: str | None) -> float | None:
     if not raw:
         return None
 
-    match = _MINUTE_PATTERN.match(raw)
-    if match:
-        minutes = int(match.group(1))
-        seconds = int(match.group(2))
-        hundredths = int(match.group(3))
-        if seconds >= 60:
-            raise ValueError(f"Invalid time format: {value}")
-        return minutes * 60 + seconds + hundredths / 100
-
-    match = _SECOND_PATTERN.match(raw)
-    if match:
-        seconds = int(match.group(1))
-        hundredths = int(match.group(2))
+    # Plain string scan: [minutes ":"] seconds "." hundredths
+    colon = raw.find(":")
+    rest = raw[colon + 1:] if colon >= 0 else raw
+    seconds_text, dot, hundredths_text = rest.partition(".")
+    if not (
+        dot
+        and len(hundredths_text) == 2
+        and hundredths_text.isdecimal()
+        and seconds_text.isdecimal()
+    ):
+        raise ValueError(f"Invalid time format: {value}")
+
+    seconds = int(seconds_text)
+    hundredths = int(hundredths_text)
+    if colon < 0:
         return seconds + hundredths / 100
 
-    raise ValueError(f"Invalid time format: {value}")
+    minutes_text = raw[:colon]
+    if not minutes_text.isdecimal() or len(seconds_text) != 2 or seconds >= 60:
+        raise ValueError(f"Invalid time format: {value}")
+    return int(minutes_text) * 60 + seconds + hundredths / 100
 
 
 def format_seconds_to_time(seconds: float | None) -> str:
@@ -103,49 +141,104 @@ def format_seconds_to_time(seconds: float | None) -> str:
     if seconds is None:
         return ""
 
-    total = max(0.0, float(seconds))
-    total = round(total, 2)
-    minutes = int(total // 60)
-    remainder = round(total - minutes * 60, 2)
-
-    # Handle rounding that bumps remainder to 60.00
-    if remainder >= 60:
-        minutes += 1
-        remainder -= 60
+    # Integer hundredths avoid float remainders (and a 60.00 carry fix-up)
+    total = round(max(0.0, float(seconds)) * 100)
+    minutes, rest = divmod(total, 6000)
+    secs, hundredths = divmod(rest, 100)
 
     if minutes:
-        return f"{minutes}:{remainder:05.2f}"
-    return f"{remainder:.2f}"
-
-
-def _build_form_from_swimmer(swimmer: Swimmer, events: list[Event]) -> Dict[str, Dict[str, str]]:
-    rows: Dict[str, Dict[str, str]] = {}
-    pb_map = {pb.event: pb for pb in swimmer.pbs}
-    for event in events:
-        pb = pb_map.get(event)
-        rows[event.name] = {
-            "points": str(pb.points) if pb else "",
-            "time": format_seconds_to_time(pb.time_seconds) if pb else "",
-        }
-    return rows
+        return f"{minutes}:{secs:02d}.{hundredths:02d}"
+    return f"{secs}.{hundredths:02d}"
+
+
+def _build_form_from_swimmer(
+    swimmer: Swimmer,
+    events: Sequence[Event],
+    pb_map: Dict[Event, PB] | None = None,
+) -> PBForm:
+    points, times = _empty_pb_form(events)
+    if pb_map is None:
+        pb_map = {pb.event: pb for pb in swimmer.pbs}
+    for event, pb in pb_map.items():
+        name = _EVENT_NAMES[event]
+        if name in points:
+            points[name] = str(pb.points)
+            times[name] = format_seconds_to_time(pb.time_seconds)
+    return points, times
+
+
+@lru_cache(maxsize=16)
+def _segment_meta(
+    gender: str, competition: str
+) -> tuple[
+    tuple[tuple[Event, ...], ...],
+    tuple[int, ...],
+    tuple[str, ...],
+    tuple[tuple[Event, int], ...],
+]:
+    """Return (segments, slot offsets, labels, event occurrences) for a roster/competition.
+
+    Raises ValueError for unsupported combinations, like get_segments.
+    """
+    segments = optimizer.get_segments(gender, competition)
+    offsets = tuple(accumulate(map(len, segments), initial=0))
+    if competition == "Allgemeine Kategorie":
+        labels = tuple(
+            f"Day {seg_idx // 2 + 1}, Segment {seg_idx % 2 + 1}" for seg_idx in range(len(segments))
+        )
+    else:
+        labels = tuple(f"Segment {seg_idx + 1}" for seg_idx in range(len(segments)))
+    occurrences = tuple(Counter(event for segment in segments for event in segment).items())
+    return segments, offsets, labels, occurrences
+
+
+def _format_solution(
+    lineup: list[tuple],
+    segment_offsets: Sequence[int],
+    segment_labels: Sequence[str],
+    names: dict[int, str],
+) -> dict:
+    """Group the optimizer assignment into labelled per-segment rows."""
+    buckets: list[list[dict]] = [[] for _ in segment_labels]
+    total_points = 0
+
+    # Single pass: bucket each assignment into its segment. The optimizer
+    # emits assignments in slot order, so every bucket comes out sorted.
+    for slot, seg_idx, event, swimmer_id, pts in lineup:
+        total_points += pts
+        buckets[seg_idx].append({
+            "slot": slot - segment_offsets[seg_idx] + 1,
+            "event": event.value,
+            "swimmer": names.get(swimmer_id, "—"),
+            "points": pts,
+        })
+
+    segment_rows: list[dict] = []
+    for label, rows in zip(segment_labels, buckets):
+        segment_rows.append({"label": label, "entries": rows})
+    return {"total_points": int(total_points), "segments": segment_rows}
 
 
 @bp.route("/", methods=["GET", "POST"])
 @login_required
 def index() -> str:
     """List swimmers grouped by gender."""
-    female_stmt = (
-        select(Swimmer)
-        .where(Swimmer.gender == "f", Swimmer.owner_id == current_user.id)
-        .order_by(Swimmer.name.asc())
-    )
-    male_stmt = (
+    owner_id = current_user.id  # resolve the LocalProxy once per request
+    # The PB count is loaded with the listing instead of lazily per row; the
+    # listing never needs the PB rows themselves
+    listing_stmt = (
         select(Swimmer)
-        .where(Swimmer.gender == "m", Swimmer.owner_id == current_user.id)
-        .order_by(Swimmer.name.asc())
+        .options(undefer(Swimmer.pb_count))
+        .where(Swimmer.owner_id == owner_id)
+        .order_by(Swimmer.gender.asc(), Swimmer.name.asc())
     )
-    female_swimmers = db.session.scalars(female_stmt).all()
-    male_swimmers = db.session.scalars(male_stmt).all()
+    female_swimmers: list[Swimmer] = []
+    male_swimmers: list[Swimmer] = []
+    for swimmer in db.session.scalars(listing_stmt):
+        if swimmer.gender == "f":
+            female_swimmers.append(swimmer)
+        elif swimmer.gender == "m":
+            male_swimmers.append(swimmer)
     selected_gender = request.form.get("gender", "f")
     competition = request.form.get("competition", COMPETITION_OPTIONS[0])
     enforce_rest = True if request.method == "GET" else bool(request.form.get("enforce_rest"))
@@ -155,34 +248,44 @@ def index() -> str:
     solution: dict | None = None
 
     try:
-        segments = optimizer.get_segments(selected_gender, competition)
+        segments, segment_offsets, segment_labels, occurrences = _segment_meta(
+            selected_gender, competition
+        )
     except ValueError as exc:
         errors.append(str(exc))
-        segments = []
+        segments = occurrences = ()
 
-    swimmers_for_gender: list[Swimmer] = []
+    # Swimmers with a usable PB per required event; (swimmer, event) is unique
+    # in pbs, so a plain count needs no per-event id sets
+    availability: dict[Event, int] = {event: 0 for event, _ in occurrences}
+    points: dict[tuple[int, Event], int] = {}
+    roster: dict[int, str] = {}
     if ran and not errors:
-        stmt = (
-            select(Swimmer)
-            .options(selectinload(Swimmer.pbs))
-            .where(Swimmer.gender == selected_gender, Swimmer.active.is_(True), Swimmer.owner_id == current_user.id)
+        # One round trip: active roster outer-joined with its usable PBs
+        rows = db.session.execute(
+            select(Swimmer.id, Swimmer.name, PB.event, PB.points)
+            .outerjoin(PB, (PB.swimmer_id == Swimmer.id) & (PB.points != 0))
+            .where(
+                Swimmer.gender == selected_gender,
+                Swimmer.active.is_(True),
+                Swimmer.owner_id == owner_id,
+            )
+            .order_by(Swimmer.id)
         )
-        swimmers_for_gender = list(db.session.scalars(stmt))
-        if not swimmers_for_gender:
+        # Single pass builds the roster, per-event availability and the points map
+        for swimmer_id, name, event, pts in rows:
+            roster[swimmer_id] = name
+            if event in availability:
+                availability[event] += 1
+                points[(swimmer_id, event)] = pts
+        if not roster:
             errors.append("No active swimmers available for the selected roster.")
 
     if ran and not errors:
-        from collections import Counter
-        occurrences = Counter(ev for segment in segments for ev in segment)
-        availability: dict[Event, set[int]] = {event: set() for event in occurrences}
-        for sw in swimmers_for_gender:
-            for pb in sw.pbs:
-                if pb.event in availability and pb.points:
-                    availability[pb.event].add(sw.id)
         missing = [
-            f"{event.value} (need {required}, have {len(availability[event])})"
-            for event, required in occurrences.items()
-            if len(availability[event]) < required
+            f"{event.value} (need {required}, have {availability[event]})"
+            for event, required in occurrences
+            if availability[event] < required
         ]
         if missing:
             errors.append(
@@ -190,23 +293,17 @@ def index() -> str:
             )
 
     if ran and not errors:
-        total_slots = sum(len(seg) for seg in segments)
+        total_slots = segment_offsets[-1]  # offsets end at the flat slot count
         max_races = optimizer.get_max_races_per_swimmer(competition)
-        if max_races * len(swimmers_for_gender) < total_slots:
+        if max_races * len(roster) < total_slots:
             errors.append(
                 "Roster too small for this competition: with each swimmer limited to "
                 f"{max_races} races, you need {total_slots} starts but only have "
-                f"{len(swimmers_for_gender)} active swimmers."
+                f"{len(roster)} active swimmers."
             )
 
     if ran and not errors:
-        swimmer_ids = [sw.id for sw in swimmers_for_gender]
-        points = {
-            (sw.id, pb.event): pb.points
-            for sw in swimmers_for_gender
-            for pb in sw.pbs
-            if pb.points
-        }
+        swimmer_ids = list(roster)
         try:
             lineup = optimizer.compute_best_lineup(
                 swimmers=swimmer_ids,
@@ -218,36 +315,7 @@ def index() -> str:
         except (ValueError, RuntimeError) as exc:
             errors.append(f"Optimization failed: {exc}")
         else:
-            # format solution similar to optimize._format_solution
-            segment_offsets = []
-            running = 0
-            for seg in segments:
-                segment_offsets.append(running)
-                running += len(seg)
-            total_points = int(sum(item[4] for item in lineup))
-            segment_rows: list[dict] = []
-            lookup = {sw.id: sw for sw in swimmers_for_gender}
-            for seg_idx, seg_events in enumerate(segments):
-                rows = []
-                for slot, assigned_seg_idx, event, swimmer_id, pts in lineup:
-                    if assigned_seg_idx != seg_idx:
-                        continue
-                    local_slot = slot - segment_offsets[seg_idx] + 1
-                    rows.append({
-                        "slot": local_slot,
-                        "event": event.value,
-                        "swimmer": lookup.get(swimmer_id).name if swimmer_id in lookup else "—",
-                        "points": pts,
-                    })
-                rows.sort(key=lambda item: item["slot"])
-                if competition == "Allgemeine Kategorie":
-                    day = seg_idx // 2 + 1
-                    seg_label = seg_idx % 2 + 1
-                    label = f"Day {day}, Segment {seg_label}"
-                else:
-                    label = f"Segment {seg_idx + 1}"
-                segment_rows.append({"label": label, "entries": rows})
-            solution = {"total_points": total_points, "segments": segment_rows}
+            solution = _format_solution(lineup, segment_offsets, segment_labels, roster)
 
     return render_template(
         "swimmers/main.html",
@@ -270,14 +338,9 @@ def new(gender: str):
     if gender_normalized not in {"m", "f"}:
         abort(404)
 
-    events = [
-        event
-        for event in Event
-        if not (gender_normalized == "f" and event == Event.FR_1500)
-        and not (gender_normalized == "m" and event == Event.FR_800)
-    ]
-    allowed_events = {event for event in events}
-    form_pbs = _empty_pb_form(events)
+    events = _events_for(gender_normalized)
+    allowed_mask = _allowed_mask_for(gender_normalized)
+    form_points, form_times = _empty_pb_form(events)
     name_value = ""
     swimrankings_identifier = ""
     pbest_season = "all"
@@ -289,12 +352,15 @@ def new(gender: str):
         name_value = request.form.get("name", "").strip()
         swimrankings_identifier = request.form.get("swimrankings_identifier", "").strip()
         pbest_season = request.form.get("pbest_season", "all").strip()
-        form_pbs = _extract_pb_inputs(events, request.form)
+        form_points, form_times = _extract_pb_inputs(events, request.form)
 
         if action == "import":
             if not swimrankings_identifier:
                 errors.append("Provide a Swimrankings athlete URL before importing.")
             else:
+                # httpx/bs4 only load on the first import, not at worker start
+                from ..services import swimrankings
+
                 try:
                     imported = swimrankings.fetch_personal_bests(
                         swimrankings_identifier,
@@ -305,50 +371,48 @@ def new(gender: str):
                     errors.append(str(exc))
                 else:
                     for event, payload in imported.items():
-                        if event not in allowed_events:
+                        if not allowed_mask >> EVENT_CODES[event] & 1:
                             continue
-                        form_pbs[event.name]["points"] = payload.get("points", "")
-                        form_pbs[event.name]["time"] = payload.get("time", "")
+                        name = _EVENT_NAMES[event]
+                        form_points[name] = payload.get("points", "")
+                        form_times[name] = payload.get("time", "")
                     messages.append("Personal bests imported from Swimrankings. Review and save to create the swimmer.")
         else:
             if not name_value:
                 errors.append("Name is required.")
             if not errors:
-                pb_objects: list[PB] = []
-                swimmer = Swimmer(name=name_value, gender=gender_normalized, owner_id=current_user.id)
-                db.session.add(swimmer)
-                db.session.flush()
-
+                pb_rows: list[dict[str, Any]] = []
                 for event in events:
-                    values = form_pbs[event.name]
+                    name = _EVENT_NAMES[event]
+                    points_text = form_points[name]
+                    time_text = form_times[name]
+                    if not points_text and not time_text:
+                        continue
                     try:
-                        points_value = _coerce_int(values["points"])
+                        points_value = _coerce_int(points_text)
                     except ValueError as exc:
                         errors.append(str(exc))
                         break
                     try:
-                        time_value = parse_time_to_seconds(values["time"])
+                        time_value = parse_time_to_seconds(time_text)
                     except ValueError as exc:
                         errors.append(str(exc))
                         break
 
-                    if points_value is None and time_value is None:
-                        continue
-
-                    pb_objects.append(
-                        PB(
-                            swimmer_id=swimmer.id,
-                            event=event,
-                            points=points_value if points_value is not None else 0,
-                            time_seconds=time_value,
-                        )
-                    )
+                    pb_rows.append({
+                        "event": event,
+                        "points": points_value if points_value is not None else 0,
+                        "time_seconds": time_value,
+                    })
 
-                if errors:
-                    db.session.rollback()
-                else:
-                    db.session.add_all(pb_objects)
-                    db.session.commit()
+                # Validate before touching the DB: invalid input costs no insert/rollback
+                if not errors:
+                    swimmer = Swimmer(name=name_value, gender=gender_normalized, owner_id=current_user.id)
+                    db.session.add(swimmer)
+                    db.session.flush()
+                    for row in pb_rows:
+                        row["swimmer_id"] = swimmer.id
+                    bulk_insert_pbs(pb_rows)
                     return redirect(url_for("swimmers.edit", swimmer_id=swimmer.id))
 
     gender_label = "Female" if gender_normalized == "f" else "Male"
@@ -357,7 +421,8 @@ def new(gender: str):
         gender=gender_normalized,
         gender_label=gender_label,
         form_name=name_value,
-        form_pbs=form_pbs,
+        form_points=form_points,
+        form_times=form_times,
         events=events,
         swimrankings_identifier=swimrankings_identifier,
         pbest_season=pbest_season,
@@ -369,16 +434,12 @@ def new(gender: str):
 @bp.route("/<int:swimmer_id>/edit", methods=["GET", "POST"])
 @login_required
 def edit(swimmer_id: int):
-    swimmer = _get_swimmer_or_404(swimmer_id)
-    events = [
-        event
-        for event in Event
-        if not (swimmer.gender == "f" and event == Event.FR_1500)
-        and not (swimmer.gender == "m" and event == Event.FR_800)
-    ]
-    allowed_events = {event for event in events}
-
-    form_pbs = _build_form_from_swimmer(swimmer, events)
+    swimmer = _get_swimmer_or_404(swimmer_id, load_pbs=True)
+    events = _events_for(swimmer.gender)
+    allowed_mask = _allowed_mask_for(swimmer.gender)
+
+    pb_map = {pb.event: pb for pb in swimmer.pbs}
+    form_points, form_times = _build_form_from_swimmer(swimmer, events, pb_map)
     form_name = swimmer.name
     swimrankings_identifier = ""
     pbest_season = "all"
@@ -390,12 +451,15 @@ def edit(swimmer_id: int):
         form_name = request.form.get("name", form_name).strip()
         swimrankings_identifier = request.form.get("swimrankings_identifier", "").strip()
         pbest_season = request.form.get("pbest_season", "all").strip()
-        form_pbs = _extract_pb_inputs(events, request.form)
+        form_points, form_times = _extract_pb_inputs(events, request.form)
 
         if action == "import":
             if not swimrankings_identifier:
                 errors.append("Provide a Swimrankings athlete URL or ID before importing.")
             else:
+                # httpx/bs4 only load on the first import, not at worker start
+                from ..services import swimrankings
+
                 try:
                     imported = swimrankings.fetch_personal_bests(
                         swimrankings_identifier,
@@ -406,57 +470,75 @@ def edit(swimmer_id: int):
                     errors.append(str(exc))
                 else:
                     for event, payload in imported.items():
-                        if event not in allowed_events:
+                        if not allowed_mask >> EVENT_CODES[event] & 1:
                             continue
-                        form_pbs[event.name]["points"] = payload.get("points", "")
-                        form_pbs[event.name]["time"] = payload.get("time", "")
+                        name = _EVENT_NAMES[event]
+                        form_points[name] = payload.get("points", "")
+                        form_times[name] = payload.get("time", "")
                     if not errors:
                         messages.append("Imported personal bests from Swimrankings. Review and save to apply them.")
         else:
             if not form_name:
                 errors.append("Name is required.")
 
-            pb_map = {pb.event: pb for pb in swimmer.pbs}
+            to_insert: list[dict[str, Any]] = []
+            to_update: list[dict[str, Any]] = []
+            to_delete: list[int] = []
+            # Rows to render once the save succeeds (what the DB will hold)
+            saved_points, saved_times = _empty_pb_form(events)
 
             for event in events:
-                values = form_pbs[event.name]
+                name = _EVENT_NAMES[event]
+                points_text = form_points[name]
+                time_text = form_times[name]
+                existing = pb_map.get(event)
+                if not points_text and not time_text:
+                    # Blank row: skip the parsers entirely
+                    if existing:
+                        to_delete.append(existing.id)
+                    continue
                 try:
-                    points_value = _coerce_int(values["points"])
+                    points_value = _coerce_int(points_text)
                 except ValueError as exc:
                     errors.append(str(exc))
                     break
                 try:
-                    time_value = parse_time_to_seconds(values["time"])
+                    time_value = parse_time_to_seconds(time_text)
                 except ValueError as exc:
                     errors.append(str(exc))
                     break
 
-                existing = pb_map.get(event)
-
-                if points_value is None and time_value is None:
+                if points_value is None:
+                    # A time without points is not stored; keep what is there
                     if existing:
-                        db.session.delete(existing)
-                    continue
-                
-                if points_value is not None:
-                    if existing is None and points_value is not None:
-                        db.session.add(
-                            PB(
-                                swimmer_id=swimmer.id,
-                                event=event,
-                                points=points_value,
-                                time_seconds=time_value,
-                            )
-                        )
-                    else:
-                        existing.points = points_value
-                        existing.time_seconds = time_value
+                        saved_points[name] = str(existing.points)
+                        saved_times[name] = format_seconds_to_time(existing.time_seconds)
+                else:
+                    saved_points[name] = str(points_value)
+                    saved_times[name] = format_seconds_to_time(time_value)
+                    if existing is None:
+                        to_insert.append({
+                            "swimmer_id": swimmer.id,
+                            "event": event,
+                            "points": points_value,
+                            "time_seconds": time_value,
+                        })
+                    elif existing.points != points_value or existing.time_seconds != time_value:
+                        to_update.append({"id": existing.id, "points": points_value, "time_seconds": time_value})
 
             if not errors:
+                # One statement per kind of change instead of a flush per PB
+                if to_delete:
+                    db.session.execute(sql_delete(PB).where(PB.id.in_(to_delete)))
+                if to_update:
+                    db.session.execute(update(PB), to_update)
+                if to_insert:
+                    # Table-level insert stays one executemany when some times are blank
+                    db.session.execute(insert(PB.__table__), to_insert)
                 swimmer.name = form_name
                 db.session.commit()
                 messages.append("Swimmer updated.")
-                form_pbs = _build_form_from_swimmer(swimmer, events)
+                form_points, form_times = saved_points, saved_times
                 form_name = swimmer.name
 
     gender_label = "Female" if swimmer.gender == "f" else "Male"
@@ -465,7 +547,8 @@ def edit(swimmer_id: int):
         swimmer=swimmer,
         gender_label=gender_label,
         events=events,
-        form_pbs=form_pbs,
+        form_points=form_points,
+        form_times=form_times,
         form_name=form_name,
         swimrankings_identifier=swimrankings_identifier,
         pbest_season=pbest_season,
@@ -486,13 +569,17 @@ def toggle_active(swimmer_id: int):
 @bp.delete("/<int:swimmer_id>")
 @login_required
 def delete(swimmer_id: int) -> Any:
-    swimmer = _get_swimmer_or_404(swimmer_id)
-    db.session.delete(swimmer)
+    # Single owner-scoped DELETE; PBs go with it via ON DELETE CASCADE
+    result = db.session.execute(
+        sql_delete(Swimmer).where(Swimmer.id == swimmer_id, Swimmer.owner_id == current_user.id)
+    )
+    if result.rowcount == 0:
+        abort(404)
     db.session.commit()
 
     if _is_htmx(request):
         response = make_response("", 204)
-        response.headers["HX-Redirect"] = url_for("swimmers.index")
+        response.headers["HX-Redirect"] = static_url("swimmers.index")
         return response
 
-    return redirect(url_for("swimmers.index"))
+    return redirect(static_url("swimmers.index"))
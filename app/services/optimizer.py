@@ -1,5 +1,14 @@
+"""Lineup optimizer for the team competition.
+
+Inputs that no lineup can satisfy (too few swimmers for the slot count or
+for an event's repeats) raise ValueError before a model is built; a roster
+of exactly one swimmer per slot with uniform points is assigned directly.
+"""
+import time
+from functools import lru_cache
+
 from ortools.linear_solver import pywraplp
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
 
 from ..models import Event
 
@@ -32,15 +41,27 @@ MAX_RACES_PER_SWIMMER: Dict[str, int] = {
     "Nachwuchs": 4,
 }
 
+# Wall-clock budget for all CBC passes of one lineup together: each pass
+# gets whatever the earlier ones left, so one optimize request holds its
+# Gunicorn worker for at most this long plus model building, and a
+# pathological roster fails with RuntimeError instead of running on
+SOLVE_TIME_BUDGET_MS = 20_000
+
+
+@lru_cache(maxsize=16)
+def get_segments(gender: str, competition: str) -> Tuple[Tuple[Event, ...], ...]:
+    """Return the segment definition for the given roster/competition.
 
-def get_segments(gender: str, competition: str) -> List[List[Event]]:
-    """Return the segment definition for the given roster/competition."""
+    The result is cached and immutable; restart workers after editing
+    SEGMENT_CATALOG.
+    """
 
     key = (gender.lower(), competition)
     try:
-        return SEGMENT_CATALOG[key]
+        segments = SEGMENT_CATALOG[key]
     except KeyError as exc:
         raise ValueError("Unsupported roster/competition combination.") from exc
+    return tuple(tuple(seg) for seg in segments)
 
 
 def get_max_races_per_swimmer(competition: str) -> int:
@@ -49,220 +70,316 @@ def get_max_races_per_swimmer(competition: str) -> int:
 def compute_best_lineup(
     swimmers: List[int],
     points: Dict[Tuple[int, Event], float],
-    segments: List[List[Event]],
+    segments: Sequence[Sequence[Event]],
     max_races_per_swimmer: int,
     enforce_adjacent_rest: bool = False,
 ) -> List[Tuple[int, int, Event, int, float]]:
     """
     Optimizer:
-      Pass 1: maximize total points.
-      Pass 2: with points fixed, maximize # of distinct swimmers used.
-      Pass 3: with (points, #used) fixed, minimize maximum total races per swimmer.
-      Pass 4: with (points, #used, minimax) fixed, improve temporal smoothness per segment:
+      Pass 1: maximize total points, then # of distinct swimmers used, then
+              minimize maximum total races per swimmer (one weighted objective;
+              points are whole numbers, as stored on PB).
+      Pass 2: with (points, #used, minimax) fixed, improve temporal smoothness per segment:
               A) avoid adjacency (gap=0),
               B) avoid gap=1 pairs (one-break),
               C) minimize max per-segment load,
               D) (only if 4 segments = 2 days) minimize max per-swimmer day imbalance.
     Returns:
-        assignment: List[(slot, seg_idx, event, swimmer, pts)]
+        assignment: List[(slot, seg_idx, event, swimmer, pts)], in slot order
+
+    Results are memoized per process on the exact inputs, so re-running an
+    unchanged roster skips the solver. Swimmer order is part of the key: it
+    decides which of several equally good lineups is returned.
+    """
+    return list(_cached_lineup(
+        tuple(swimmers),
+        frozenset(points.items()),
+        tuple(tuple(seg) for seg in segments),
+        max_races_per_swimmer,
+        enforce_adjacent_rest,
+    ))
+
+
+@lru_cache(maxsize=128)
+def _cached_lineup(
+    swimmers: Tuple[int, ...],
+    points: frozenset,
+    segments: Tuple[Tuple[Event, ...], ...],
+    max_races_per_swimmer: int,
+    enforce_adjacent_rest: bool,
+) -> Tuple[Tuple[int, int, Event, int, float], ...]:
+    return tuple(_solve_lineup(
+        list(swimmers),
+        dict(points),
+        segments,
+        max_races_per_swimmer,
+        enforce_adjacent_rest,
+    ))
+
+
+@lru_cache(maxsize=16)
+def _segment_layout(segments: Tuple[Tuple[Event, ...], ...]):
+    """Slot bookkeeping that depends only on the segments.
+
+    Slots are numbered 0..n-1 in segment order and described by parallel
+    tuples rather than one (slot, seg_idx, event) tuple each. Returns
+    (slot_seg, slot_event, segment_slot_indices, seg_offsets,
+    event_slot_groups, adjacent_pairs), all as tuples so the cached value
+    cannot be mutated by a caller.
     """
 
-    # ---- Build flat slot list and segment base offsets ----
-    slots: List[Tuple[int, int, Event]] = []
-    segment_slot_indices: List[List[int]] = []
-    slot_counter = 0
-    for seg_idx, seg in enumerate(segments):
-        indices = []
-        for ev in seg:
-            slots.append((slot_counter, seg_idx, ev))
-            indices.append(slot_counter)
-            slot_counter += 1
-        segment_slot_indices.append(indices)
-
-    # Cumulative starting index for each segment in the flattened slot list
+    # ---- Flat per-slot segment and event, plus segment base offsets ----
+    slot_seg: List[int] = []
+    slot_event: List[Event] = []
+    segment_slot_indices: List[range] = []
     seg_offsets: List[int] = []
-    running = 0
-    for seg in segments:
-        seg_offsets.append(running)
-        running += len(seg)
+    for seg_idx, seg in enumerate(segments):
+        base = len(slot_event)
+        seg_offsets.append(base)
+        segment_slot_indices.append(range(base, base + len(seg)))
+        slot_seg.extend([seg_idx] * len(seg))
+        slot_event.extend(seg)
+
+    # Slots per event, so one-event-per-swimmer rows don't rescan every slot
+    slots_by_event: Dict[Event, List[int]] = {}
+    for slot, ev in enumerate(slot_event):
+        slots_by_event.setdefault(ev, []).append(slot)
+    # Back-to-back slot pairs within each segment (used by rest rows and A)
+    adjacent_pairs = tuple(
+        (g, i, indices[i], indices[i + 1])
+        for g, indices in enumerate(segment_slot_indices)
+        for i in range(len(indices) - 1)
+    )
+    return (
+        tuple(slot_seg),
+        tuple(slot_event),
+        tuple(segment_slot_indices),
+        tuple(seg_offsets),
+        tuple(tuple(ev_slots) for ev_slots in slots_by_event.values()),
+        adjacent_pairs,
+    )
+
+
+def _check_feasibility(
+    num_swimmers: int,
+    num_slots: int,
+    event_slot_groups: Sequence[Sequence[int]],
+    max_races_per_swimmer: int,
+) -> None:
+    if num_swimmers * max_races_per_swimmer < num_slots:
+        raise ValueError(
+            f"{num_slots} starts need more than {num_swimmers} swimmers "
+            f"at {max_races_per_swimmer} races each."
+        )
+    # Each swimmer swims an event at most once, so repeats need distinct swimmers
+    if any(len(ev_slots) > num_swimmers for ev_slots in event_slot_groups):
+        raise ValueError("Not enough swimmers to cover every start of an event.")
+
+
+def _trivial_assignment(
+    swimmers: List[int],
+    points: Dict[Tuple[int, Event], float],
+    slot_seg: Sequence[int],
+    slot_event: Sequence[Event],
+):
+    """One swimmer per slot with identical points everywhere: any bijection is
+    optimal on every tier, so assign swimmers to slots in order. Returns None
+    when the instance is not of that shape."""
+
+    if len(swimmers) != len(slot_event):
+        return None
+    values = {points.get((s, ev)) for s in swimmers for ev in set(slot_event)}
+    if len(values) != 1 or None in values:
+        return None
+    pts = values.pop()
+    return [(slot, seg_idx, ev, s, pts)
+            for slot, (s, seg_idx, ev) in enumerate(zip(swimmers, slot_seg, slot_event))]
+
+
+def _add_row(
+    solver: pywraplp.Solver,
+    lb: float,
+    ub: float,
+    variables: Sequence[pywraplp.Variable],
+    coeffs: Sequence[float] | None = None,
+) -> pywraplp.Constraint:
+    """Add lb <= sum(coeff * var) <= ub (unit coefficients by default).
+
+    Coefficients go straight onto the row instead of through the expression
+    tree solver.Add builds and then walks term by term; each variable may
+    appear only once.
+    """
+    row = solver.Constraint(lb, ub)
+    if coeffs is None:
+        for var in variables:
+            row.SetCoefficient(var, 1)
+    else:
+        for var, coeff in zip(variables, coeffs):
+            row.SetCoefficient(var, coeff)
+    return row
+
+
+def _set_objective(
+    solver: pywraplp.Solver,
+    variables: Sequence[pywraplp.Variable],
+    coeffs: Sequence[float],
+    maximize: bool,
+) -> None:
+    """Replace the objective with sum(coeff * var), like _add_row."""
+    objective = solver.Objective()
+    objective.Clear()
+    for var, coeff in zip(variables, coeffs):
+        objective.SetCoefficient(var, coeff)
+    objective.SetOptimizationDirection(maximize)
+
+
+def _solve_lineup(
+    swimmers: List[int],
+    points: Dict[Tuple[int, Event], float],
+    segments: Sequence[Sequence[Event]],
+    max_races_per_swimmer: int,
+    enforce_adjacent_rest: bool,
+) -> List[Tuple[int, int, Event, int, float]]:
+    """Run the two CBC passes described in compute_best_lineup."""
 
-    events_present = set(ev for *_, ev in slots)
+    (slot_seg, slot_event, segment_slot_indices, seg_offsets, event_slot_groups,
+     adjacent_pairs) = _segment_layout(tuple(tuple(seg) for seg in segments))
+    all_slot_indices = range(len(slot_event))
+    # Only events swum more than once need a one-start-per-swimmer row
+    repeated_event_groups = [ev_slots for ev_slots in event_slot_groups if len(ev_slots) > 1]
     S = len(swimmers)
     seg_lengths = [len(seg) for seg in segments]
     Nmax = max(seg_lengths) if seg_lengths else 0
     BIG = max_races_per_swimmer
 
-    # ---- PASS 1: maximize total points ----
-    solver1 = pywraplp.Solver.CreateSolver("CBC")
-    if not solver1:
-        raise RuntimeError("OR-Tools CBC solver not available (pass 1)")
-
-    x1 = {(s, slot): solver1.BoolVar(f"x1_s{s}_{slot}")
-          for s in swimmers for (slot, _, _) in slots}
-
-    # constraints
-    for (slot, _, _) in slots:
-        solver1.Add(solver1.Sum(x1[(s, slot)] for s in swimmers) == 1)
-    for s in swimmers:
-        solver1.Add(solver1.Sum(x1[(s, slot)] for (slot, _, _) in slots) <= max_races_per_swimmer)
-    for s in swimmers:
-        for ev in events_present:
-            solver1.Add(solver1.Sum(x1[(s, slot)] for (slot, _, ev2) in slots if ev2 == ev) <= 1)
-    if enforce_adjacent_rest:
-        for (slot, seg_idx, _) in slots:
-            base = seg_offsets[seg_idx]
-            seg_len = len(segments[seg_idx])
-            local = slot - base
-            if local + 1 < seg_len:
-                for s in swimmers:
-                    solver1.Add(x1[(s, slot)] + x1[(s, slot + 1)] <= 1)
-
-    total_points1 = solver1.Sum(points.get((s, ev), 0.0) * x1[(s, slot)]
-                                for s in swimmers for (slot, _, ev) in slots)
-    solver1.Maximize(total_points1)
-    if solver1.Solve() != pywraplp.Solver.OPTIMAL:
-        raise RuntimeError("First pass failed")
-    best_points = int(round(total_points1.solution_value()))
-
-    # ---- PASS 2: maximize number of swimmers used (points fixed) ----
-    solver2 = pywraplp.Solver.CreateSolver("CBC")
-    if not solver2:
-        raise RuntimeError("OR-Tools CBC solver not available (pass 2)")
-
-    x2 = {(s, slot): solver2.BoolVar(f"x2_s{s}_{slot}")
-          for s in swimmers for (slot, _, _) in slots}
+    _check_feasibility(S, len(slot_event), event_slot_groups, max_races_per_swimmer)
+    trivial = _trivial_assignment(swimmers, points, slot_seg, slot_event)
+    if trivial is not None:
+        return trivial
+
+    # Objective terms flattened once: only (swimmer, slot) pairs that
+    # actually score, so the objective skips the zero products
+    # Each event's scorers are looked up once and shared by all its slots
+    scored: List[Tuple[int, int, float]] = []
+    for ev_slots in event_slot_groups:
+        ev = slot_event[ev_slots[0]]
+        scorers = [(s, points[(s, ev)]) for s in swimmers if points.get((s, ev))]
+        for slot in ev_slots:
+            scored.extend((s, slot, pts) for (s, pts) in scorers)
+
+    # ---- One model for all passes ----
+    # Variables and hard constraints are built once; each lexicographic pass
+    # swaps the objective and then locks its optimum in as a constraint.
+    # CBC rather than SCIP or HiGHS: with rest enforced (the default) it is
+    # the fastest of the three on this model, equality locks included.
+    # It runs single-threaded: the CBC bundled with OR-Tools is built without
+    # thread support and rejects a thread count; the Gunicorn workers solve
+    # separate requests in parallel instead.
+    solver = pywraplp.Solver.CreateSolver("CBC")
+    if not solver:
+        raise RuntimeError("OR-Tools CBC solver not available")
+
+    # x[s][slot]: one row of slot variables per swimmer, indexed by slot
+    # number, so lookups skip building and hashing (swimmer, slot) tuples
+    x = {s: [solver.BoolVar(f"x_s{s}_{slot}") for slot in all_slot_indices]
+         for s in swimmers}
+
+    inf = solver.infinity()
+    num_slots = len(slot_event)
 
-    for (slot, _, _) in slots:
-        solver2.Add(solver2.Sum(x2[(s, slot)] for s in swimmers) == 1)
-    for s in swimmers:
-        solver2.Add(solver2.Sum(x2[(s, slot)] for (slot, _, _) in slots) <= max_races_per_swimmer)
-    for s in swimmers:
-        for ev in events_present:
-            solver2.Add(solver2.Sum(x2[(s, slot)] for (slot, _, ev2) in slots if ev2 == ev) <= 1)
-    if enforce_adjacent_rest:
-        for (slot, seg_idx, _) in slots:
-            base = seg_offsets[seg_idx]
-            seg_len = len(segments[seg_idx])
-            local = slot - base
-            if local + 1 < seg_len:
-                for s in swimmers:
-                    solver2.Add(x2[(s, slot)] + x2[(s, slot + 1)] <= 1)
-
-    tot2 = solver2.Sum(points.get((s, ev), 0.0) * x2[(s, slot)]
-                       for s in swimmers for (slot, _, ev) in slots)
-    solver2.Add(tot2 == best_points)
-
-    used2 = {s: solver2.BoolVar(f"used2_s{s}") for s in swimmers}
-    for s in swimmers:
-        races_s = solver2.Sum(x2[(s, slot)] for (slot, _, _) in slots)
-        solver2.Add(races_s <= BIG * used2[s])
-        solver2.Add(races_s >= used2[s])
-
-    solver2.Maximize(solver2.Sum(used2[s] for s in swimmers))
-    if solver2.Solve() != pywraplp.Solver.OPTIMAL:
-        raise RuntimeError("Second pass failed")
-    max_used = int(round(sum(used2[s].solution_value() for s in swimmers)))
-
-    # ---- PASS 3: minimize max total races per swimmer (with points & #used fixed) ----
-    solver3 = pywraplp.Solver.CreateSolver("CBC")
-    if not solver3:
-        raise RuntimeError("OR-Tools CBC solver not available (pass 3)")
-
-    x3 = {(s, slot): solver3.BoolVar(f"x3_s{s}_{slot}")
-          for s in swimmers for (slot, _, _) in slots}
-
-    for (slot, _, _) in slots:
-        solver3.Add(solver3.Sum(x3[(s, slot)] for s in swimmers) == 1)
+    # hard constraints
+    for slot in all_slot_indices:
+        _add_row(solver, 1, 1, [x[s][slot] for s in swimmers])
     for s in swimmers:
-        solver3.Add(solver3.Sum(x3[(s, slot)] for (slot, _, _) in slots) <= max_races_per_swimmer)
+        _add_row(solver, 0, max_races_per_swimmer, x[s])
     for s in swimmers:
-        for ev in events_present:
-            solver3.Add(solver3.Sum(x3[(s, slot)] for (slot, _, ev2) in slots if ev2 == ev) <= 1)
+        for ev_slots in repeated_event_groups:
+            _add_row(solver, 0, 1, [x[s][slot] for slot in ev_slots])
     if enforce_adjacent_rest:
-        for (slot, seg_idx, _) in slots:
-            base = seg_offsets[seg_idx]
-            seg_len = len(segments[seg_idx])
-            local = slot - base
-            if local + 1 < seg_len:
+        # Rest between starts: one two-variable row per back-to-back pair
+        for (_, _, a, b) in adjacent_pairs:
+            for s in swimmers:
+                _add_row(solver, 0, 1, (x[s][a], x[s][b]))
+        # Implied cardinality cut: with rest between starts a swimmer takes at
+        # most every other slot of a segment
+        for indices in segment_slot_indices:
+            if len(indices) >= 3:
                 for s in swimmers:
-                    solver3.Add(x3[(s, slot)] + x3[(s, slot + 1)] <= 1)
-
-    tot3 = solver3.Sum(points.get((s, ev), 0.0) * x3[(s, slot)]
-                       for s in swimmers for (slot, _, ev) in slots)
-    solver3.Add(tot3 == best_points)
-
-    used3 = {s: solver3.BoolVar(f"used3_s{s}") for s in swimmers}
-    for s in swimmers:
-        y = solver3.Sum(x3[(s, slot)] for (slot, _, _) in slots)
-        solver3.Add(y <= BIG * used3[s])
-        solver3.Add(y >= used3[s])
-    solver3.Add(solver3.Sum(used3[s] for s in swimmers) == max_used)
+                    _add_row(solver, 0, (len(indices) + 1) // 2, [x[s][slot] for slot in indices])
 
-    y3 = {s: solver3.IntVar(0, max_races_per_swimmer, f"y3_s{s}") for s in swimmers}
+    # Symmetry breaking: swimmers with identical points on every event are
+    # interchangeable, so order their race counts (caller order wins ties)
+    events = [slot_event[ev_slots[0]] for ev_slots in event_slot_groups]
+    twins: Dict[Tuple[float, ...], List[int]] = {}
     for s in swimmers:
-        solver3.Add(y3[s] == solver3.Sum(x3[(s, slot)] for (slot, _, _) in slots))
-
-    Mtot = solver3.IntVar(0, max_races_per_swimmer, "Mtot")
+        profile = tuple(points.get((s, ev), 0.0) for ev in events)
+        twins.setdefault(profile, []).append(s)
+    for group in twins.values():
+        for a, b in zip(group, group[1:]):
+            _add_row(solver, 0, inf, x[a] + x[b], [1] * num_slots + [-1] * num_slots)
+
+    # Prove optimality exactly: the default 1e-4 relative gap is wider than
+    # the weight of the lower tiers folded into pass 1
+    params = pywraplp.MPSolverParameters()
+    params.SetDoubleParam(params.RELATIVE_MIP_GAP, 0.0)
+
+    deadline = time.monotonic() + SOLVE_TIME_BUDGET_MS / 1000
+
+    def _solve(name: str) -> None:
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            raise RuntimeError(f"{name} pass failed: out of time")
+        solver.SetTimeLimit(remaining_ms)
+        # A time-limited pass ends FEASIBLE at best; locking in a non-optimal
+        # value would silently change the lower tiers, so fail the request
+        if solver.Solve(params) != pywraplp.Solver.OPTIMAL:
+            raise RuntimeError(f"{name} pass failed")
+
+    # ---- PASS 1: points >> #used >> minimax races ----
+    score_vars = [x[s][slot] for (s, slot, _) in scored]
+    score_coeffs = [pts for (_, _, pts) in scored]
+
+    used = [solver.BoolVar(f"used_s{s}") for s in swimmers]
+    ones = [1] * num_slots
+    for s, used_s in zip(swimmers, used):
+        _add_row(solver, -inf, 0, x[s] + [used_s], ones + [-BIG])  # races <= BIG * used
+        _add_row(solver, 0, inf, x[s] + [used_s], ones + [-1])     # races >= used
+
+    Mtot = solver.IntVar(0, max_races_per_swimmer, "Mtot")
     for s in swimmers:
-        solver3.Add(y3[s] <= Mtot)
-
-    solver3.Minimize(Mtot)
-    if solver3.Solve() != pywraplp.Solver.OPTIMAL:
-        raise RuntimeError("Third pass failed")
+        _add_row(solver, -inf, 0, x[s] + [Mtot], ones + [-1])
+
+    # Whole-number points: one point outweighs the full range of #used and
+    # Mtot below it, and one more swimmer outweighs the range of Mtot
+    W_used = max_races_per_swimmer + 1
+    W_pts = (S + 1) * W_used
+    _set_objective(
+        solver,
+        score_vars + used + [Mtot],
+        [W_pts * pts for pts in score_coeffs] + [W_used] * S + [-1],
+        maximize=True,
+    )
+    _solve("First")
+    best_points = int(round(sum(pts * var.solution_value()
+                                for var, pts in zip(score_vars, score_coeffs))))
+    max_used = int(round(sum(var.solution_value() for var in used)))
     min_max_total = int(round(Mtot.solution_value()))
+    _add_row(solver, best_points, best_points, score_vars, score_coeffs)
+    _add_row(solver, max_used, max_used, used)
+    Mtot.SetUb(min_max_total)  # preserve global minimax
 
-    # ---- PASS 4: spacing (adjacency > one-break > per-seg max [> per-day balance if 4 segs]) ----
-    solver4 = pywraplp.Solver.CreateSolver("CBC")
-    if not solver4:
-        raise RuntimeError("OR-Tools CBC solver not available (pass 4)")
+    # ---- PASS 2: spacing (adjacency > one-break > per-seg max [> per-day balance if 4 segs]) ----
 
-    x4 = {(s, slot): solver4.BoolVar(f"x4_s{s}_{slot}")
-          for s in swimmers for (slot, _, _) in slots}
-
-    # hard constraints
-    for (slot, _, _) in slots:
-        solver4.Add(solver4.Sum(x4[(s, slot)] for s in swimmers) == 1)
-    for s in swimmers:
-        solver4.Add(solver4.Sum(x4[(s, slot)] for (slot, _, _) in slots) <= max_races_per_swimmer)
-    for s in swimmers:
-        for ev in events_present:
-            solver4.Add(solver4.Sum(x4[(s, slot)] for (slot, _, ev2) in slots if ev2 == ev) <= 1)
-    if enforce_adjacent_rest:
-        for (slot, seg_idx, _) in slots:
-            base = seg_offsets[seg_idx]
-            seg_len = len(segments[seg_idx])
-            local = slot - base
-            if local + 1 < seg_len:
-                for s in swimmers:
-                    solver4.Add(x4[(s, slot)] + x4[(s, slot + 1)] <= 1)
-
-    # lock points, #used, and global minimax
-    tot4 = solver4.Sum(points.get((s, ev), 0.0) * x4[(s, slot)]
-                       for s in swimmers for (slot, _, ev) in slots)
-    solver4.Add(tot4 == best_points)
-
-    used4 = {s: solver4.BoolVar(f"used4_s{s}") for s in swimmers}
-    for s in swimmers:
-        y = solver4.Sum(x4[(s, slot)] for (slot, _, _) in slots)
-        solver4.Add(y <= BIG * used4[s])
-        solver4.Add(y >= used4[s])
-        solver4.Add(y <= min_max_total)  # preserve global minimax
-    solver4.Add(solver4.Sum(used4[s] for s in swimmers) == max_used)
-
-    # A) adjacency (gap=0) penalties
+    # A) adjacency (gap=0) penalties; the rest rows already rule adjacency
+    # out, so they are only modelled when rest is not enforced. z is only
+    # pushed down by the objective, so z >= a + b - 1 alone pins it.
     z0_list = []
-    for g, seg in enumerate(segments):
-        base = seg_offsets[g]; N = len(seg)
-        for s in swimmers:
-            for i in range(N - 1):
-                a = x4[(s, base + i)]
-                b = x4[(s, base + i + 1)]
-                z = solver4.BoolVar(f"adj_{s}_{g}_{i}")
-                solver4.Add(z >= a + b - 1)
-                solver4.Add(z <= a)
-                solver4.Add(z <= b)
+    if not enforce_adjacent_rest:
+        for (g, i, slot_a, slot_b) in adjacent_pairs:
+            for s in swimmers:
+                z = solver.BoolVar(f"adj_{s}_{g}_{i}")
+                _add_row(solver, -inf, 1, (x[s][slot_a], x[s][slot_b], z), (1, 1, -1))
                 z0_list.append(z)
-    V_adj = solver4.Sum(z0_list)
 
     # B) one-break (gap=1) penalties via length-3 windows: excess >= count - 1
     z1_list = []
@@ -271,50 +388,49 @@ def compute_best_lineup(
         if N >= 3:
             for s in swimmers:
                 for i in range(N - 2):
-                    count = solver4.IntVar(0, 3, f"cnt3_{s}_{g}_{i}")
-                    solver4.Add(count == x4[(s, base + i)] +
-                                         x4[(s, base + i + 1)] +
-                                         x4[(s, base + i + 2)])
-                    exc = solver4.IntVar(0, 2, f"exc3_{s}_{g}_{i}")
-                    solver4.Add(exc >= count - 1)
+                    exc = solver.IntVar(0, 2, f"exc3_{s}_{g}_{i}")
+                    _add_row(solver, -inf, 1, x[s][base + i:base + i + 3] + [exc], [1, 1, 1, -1])
                     z1_list.append(exc)
-    V_gap1 = solver4.Sum(z1_list)
 
     # C) per-segment load balance: minimize Mseg = max_{s,g} races in segment g for swimmer s
-    y_seg = {(s, g): solver4.IntVar(0, len(seg), f"yseg_{s}_{g}")
+    y_seg = {(s, g): solver.IntVar(0, min(len(seg), min_max_total), f"yseg_{s}_{g}")
              for g, seg in enumerate(segments) for s in swimmers}
     for g, seg in enumerate(segments):
         base = seg_offsets[g]; N = len(seg)
         for s in swimmers:
-            solver4.Add(y_seg[(s, g)] == solver4.Sum(x4[(s, base + i)] for i in range(N)))
+            _add_row(solver, 0, 0, x[s][base:base + N] + [y_seg[(s, g)]], [1] * N + [-1])
 
-    Mseg = solver4.IntVar(0, Nmax, "Mseg")
-    for (s, g), ysg in y_seg.items():
-        solver4.Add(ysg <= Mseg)
+    # No swimmer can exceed the pass-1 minimax in any one segment
+    Mseg_ub = min(Nmax, min_max_total)
+    Mseg = solver.IntVar(0, Mseg_ub, "Mseg")
+    for ysg in y_seg.values():
+        _add_row(solver, -inf, 0, [ysg, Mseg], [1, -1])
 
     # D) (only if 4 segments) per-day balance: minimize max per-swimmer day imbalance
     has_two_days = (len(segments) == 4)
     if has_two_days:
         # Day 1: segments 0 & 1, Day 2: segments 2 & 3
-        day1_slots = segment_slot_indices[0] + segment_slot_indices[1]
-        day2_slots = segment_slot_indices[2] + segment_slot_indices[3]
+        day1_slots = [*segment_slot_indices[0], *segment_slot_indices[1]]
+        day2_slots = [*segment_slot_indices[2], *segment_slot_indices[3]]
 
-        d1 = {s: solver4.IntVar(0, len(day1_slots), f"d1_{s}") for s in swimmers}
-        d2 = {s: solver4.IntVar(0, len(day2_slots), f"d2_{s}") for s in swimmers}
+        d1 = {s: solver.IntVar(0, min(len(day1_slots), min_max_total), f"d1_{s}") for s in swimmers}
+        d2 = {s: solver.IntVar(0, min(len(day2_slots), min_max_total), f"d2_{s}") for s in swimmers}
         for s in swimmers:
-            solver4.Add(d1[s] == solver4.Sum(x4[(s, t)] for t in day1_slots))
-            solver4.Add(d2[s] == solver4.Sum(x4[(s, t)] for t in day2_slots))
+            _add_row(solver, 0, 0, [x[s][t] for t in day1_slots] + [d1[s]],
+                     [1] * len(day1_slots) + [-1])
+            _add_row(solver, 0, 0, [x[s][t] for t in day2_slots] + [d2[s]],
+                     [1] * len(day2_slots) + [-1])
 
         # delta_s >= |d1 - d2|
-        delta = {s: solver4.IntVar(0, min_max_total, f"ddiff_{s}") for s in swimmers}
+        delta = {s: solver.IntVar(0, min_max_total, f"ddiff_{s}") for s in swimmers}
         for s in swimmers:
-            solver4.Add(delta[s] >= d1[s] - d2[s])
-            solver4.Add(delta[s] >= d2[s] - d1[s])
+            _add_row(solver, 0, inf, [delta[s], d1[s], d2[s]], [1, -1, 1])
+            _add_row(solver, 0, inf, [delta[s], d1[s], d2[s]], [1, 1, -1])
 
         # D = max_s delta_s
-        D = solver4.IntVar(0, min_max_total, "D_day_imbalance")
+        D = solver.IntVar(0, min_max_total, "D_day_imbalance")
         for s in swimmers:
-            solver4.Add(delta[s] <= D)
+            _add_row(solver, -inf, 0, [delta[s], D], [1, -1])
     else:
         D = None  # not used
 
@@ -322,7 +438,7 @@ def compute_best_lineup(
     # Upper bounds
     UB_adj = sum(max(0, N - 1) for N in seg_lengths) * S
     UB_gap1 = sum(max(0, N - 2) * 2 for N in seg_lengths) * S
-    UB_Mseg = Nmax if Nmax > 0 else 1
+    UB_Mseg = Mseg_ub if Mseg_ub > 0 else 1
     UB_D = min_max_total if has_two_days else 0
 
     if has_two_days:
@@ -330,24 +446,31 @@ def compute_best_lineup(
         W2 = UB_D + 1
         W1 = UB_Mseg * W2 + UB_D + 1
         W0 = UB_gap1 * W1 + UB_Mseg * W2 + UB_D + 1
-        solver4.Minimize(W0 * V_adj + W1 * V_gap1 + W2 * Mseg + D)
+        tail_vars, tail_coeffs = [Mseg, D], [W2, 1]
     else:
         W1 = UB_Mseg + 1
         W0 = UB_gap1 * W1 + UB_Mseg + 1
-        solver4.Minimize(W0 * V_adj + W1 * V_gap1 + Mseg)
-
-    if solver4.Solve() != pywraplp.Solver.OPTIMAL:
-        raise RuntimeError("Fourth pass failed")
+        tail_vars, tail_coeffs = [Mseg], [1]
+    _set_objective(
+        solver,
+        z0_list + z1_list + tail_vars,
+        [W0] * len(z0_list) + [W1] * len(z1_list) + tail_coeffs,
+        maximize=False,
+    )
+
+    _solve("Second")
+
+    # ---- Extract final assignment from pass 2 ----
+    chosen_by_slot: List[int] = [0] * len(slot_event)
+    for s in swimmers:
+        for slot, var in enumerate(x[s]):
+            if var.solution_value() > 0.5:
+                chosen_by_slot[slot] = s
 
-    # ---- Extract final assignment from pass 4 ----
     assignment: List[Tuple[int, int, Event, int, float]] = []
-    for (slot, seg_idx, ev) in slots:
-        chosen = None
-        for s in swimmers:
-            if x4[(s, slot)].solution_value() > 0.5:
-                chosen = s
-                break
-        pts = points.get((chosen, ev), 0.0) if chosen is not None else 0.0
+    for slot, seg_idx, ev in zip(all_slot_indices, slot_seg, slot_event):
+        chosen = chosen_by_slot[slot]
+        pts = points.get((chosen, ev), 0.0)
         assignment.append((slot, seg_idx, ev, chosen, pts))
 
     return assignment
@@ -1,11 +1,12 @@
 """Utilities for importing personal bests from swimrankings.net."""
 from __future__ import annotations
 
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Tuple
 from urllib.parse import parse_qs, urlparse
 
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from ..models import Event
 
@@ -15,7 +16,8 @@ class SwimrankingsError(RuntimeError):
 
 
 def _normalize_label(label: str) -> str:
-    return " ".join(label.lower().split())
+    # Lowercase after collapsing whitespace, on the already-shortened text
+    return " ".join(label.split()).lower()
 
 
 def _build_event_lookup() -> Dict[str, Event]:
@@ -40,6 +42,8 @@ def _build_event_lookup() -> Dict[str, Event]:
 _EVENT_LOOKUP = _build_event_lookup()
 
 
+# Table cells repeat a few dozen distinct labels across every import
+@lru_cache(maxsize=256)
 def _map_event(label: str) -> Event | None:
     normalized = _normalize_label(label)
     return _EVENT_LOOKUP.get(normalized)
@@ -90,39 +94,33 @@ def _select_pb_table(soup) -> tuple:
 
 _ALLOWED_PBEST_SEASONS = {"2025", "2026"}
 
+# Shared client: consecutive imports reuse the pooled keep-alive connection
+# to swimrankings.net instead of a fresh TCP/TLS handshake each time
+_HTTP_CLIENT = httpx.Client(timeout=15.0)
 
-def fetch_personal_bests(
-    identifier: str,
-    expected_gender: str,
-    season: str | None = None,
-) -> Dict[Event, Dict[str, str]]:
-    """Fetch personal bests from swimrankings.net.
+_PAGE_CACHE_MAX_ENTRIES = 256
 
-    Returns a mapping of Event -> {"points": str, "time": str, "course": str}.
-    """
-    athlete_id = _extract_athlete_id(identifier)
-    if season is not None and season not in _ALLOWED_PBEST_SEASONS:
-        raise SwimrankingsError("Unsupported Swimrankings season filter.")
+# url -> (conditional request headers, page gender, parsed results)
+_page_cache: Dict[str, Tuple[Dict[str, str], str, Dict[Event, Dict[str, str]]]] = {}
 
-    url = (
-        "https://www.swimrankings.net/index.php?page=athleteDetail"
-        f"&athleteId={athlete_id}&language=us"
-    )
-    if season:
-        url += f"&pbest={season}"
 
-    try:
-        response = httpx.get(url, timeout=15.0)
-        response.raise_for_status()
-    except httpx.HTTPError as exc:
-        raise SwimrankingsError(f"Unable to fetch Swimrankings data: {exc}") from exc
+# Only the parts the parser reads get built into the tree: tables (PB rows),
+# the gender icon and the "Personal bests" heading
+_PAGE_STRAINER = SoupStrainer(["table", "img", "h2", "b"])
 
-    soup = BeautifulSoup(response.text, "html.parser")
 
-    page_gender = _extract_gender(soup)
+def _check_gender(page_gender: str, expected_gender: str) -> None:
     if page_gender != expected_gender:
         raise SwimrankingsError("Swimmer gender on Swimrankings page does not match the roster entry.")
 
+
+def _parse_personal_bests(html: str, expected_gender: str) -> tuple:
+    """Parse an athlete page into (gender, Event -> PB payload)."""
+    soup = BeautifulSoup(html, "lxml", parse_only=_PAGE_STRAINER)
+
+    page_gender = _extract_gender(soup)
+    _check_gender(page_gender, expected_gender)
+
     heading = soup.find(lambda tag: tag.name in {"h2", "b"} and "Personal bests" in tag.get_text())
     if heading is None:
         raise SwimrankingsError("Personal bests section not found on Swimrankings page.")
@@ -150,11 +148,10 @@ def fetch_personal_bests(
     preferred_course = "25m"
 
     for row in table.find_all("tr"):
-        # Skip header rows
-        if row.find("th"):
+        # One walk per row collects the cells; rows with a th are headers
+        cells = row.find_all(("td", "th"))
+        if any(cell.name == "th" for cell in cells):
             continue
-
-        cells = row.find_all("td")
         if not cells or len(cells) <= max(event_idx, points_idx, time_idx):
             continue
 
@@ -190,4 +187,53 @@ def fetch_personal_bests(
     if not results:
         raise SwimrankingsError("No personal bests were parsed from Swimrankings.")
 
-    return results
+    return page_gender, results
+
+
+def fetch_personal_bests(
+    identifier: str,
+    expected_gender: str,
+    season: str | None = None,
+) -> Dict[Event, Dict[str, str]]:
+    """Fetch personal bests from swimrankings.net.
+
+    Returns a mapping of Event -> {"points": str, "time": str, "course": str}.
+    """
+    athlete_id = _extract_athlete_id(identifier)
+    if season is not None and season not in _ALLOWED_PBEST_SEASONS:
+        raise SwimrankingsError("Unsupported Swimrankings season filter.")
+
+    url = (
+        "https://www.swimrankings.net/index.php?page=athleteDetail"
+        f"&athleteId={athlete_id}&language=us"
+    )
+    if season:
+        url += f"&pbest={season}"
+
+    # Revalidate a previously parsed page: a 304 skips download and parse
+    cached = _page_cache.get(url)
+    try:
+        response = _HTTP_CLIENT.get(url, headers=cached[0] if cached else None)
+        if cached is not None and response.status_code == 304:
+            page_gender, results = cached[1], cached[2]
+            _check_gender(page_gender, expected_gender)
+            return {event: dict(payload) for event, payload in results.items()}
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        raise SwimrankingsError(f"Unable to fetch Swimrankings data: {exc}") from exc
+
+    page_gender, results = _parse_personal_bests(response.text, expected_gender)
+
+    validators = {}
+    if "etag" in response.headers:
+        validators["If-None-Match"] = response.headers["etag"]
+    if "last-modified" in response.headers:
+        validators["If-Modified-Since"] = response.headers["last-modified"]
+    if validators:
+        if len(_page_cache) >= _PAGE_CACHE_MAX_ENTRIES:
+            _page_cache.clear()
+        _page_cache[url] = (validators, page_gender, results)
+    else:
+        _page_cache.pop(url, None)
+
+    return {event: dict(payload) for event, payload in results.items()}
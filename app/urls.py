@@ -0,0 +1,14 @@
+"""Memoized URLs for argument-less endpoints used in redirects."""
+from functools import lru_cache
+
+from flask import request, url_for
+
+
+def static_url(endpoint: str) -> str:
+    """Return ``url_for(endpoint)``, resolved once per application root."""
+    return _resolve(endpoint, request.script_root)
+
+
+@lru_cache(maxsize=64)
+def _resolve(endpoint: str, script_root: str) -> str:
+    return url_for(endpoint)
@@ -0,0 +1,61 @@
+"""Process-local cache of logged-in users so session loads skip the users query.
+
+Entries live for _TTL seconds in each process. forget() only clears the
+current process, so after a password change or account deletion other
+Gunicorn workers keep accepting the old session token until their entry
+expires (at most _TTL seconds). That window is accepted: the old password
+itself is never honoured, because credential checks and writes read the row.
+"""
+import time
+from typing import Dict, Tuple
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import make_transient_to_detached
+
+from .db import db
+from .models import User
+
+_TTL = 60.0
+_MAX_ENTRIES = 1024
+
+# user id -> (fingerprint, username, expires_at). The password hash itself is
+# never cached: anything that checks or writes credentials reads the row.
+_entries: Dict[int, Tuple[str, str, float]] = {}
+
+# Plain column rows; no ORM entity is hydrated on a cache miss
+_USER_ROW = select(User.username, User.password_hash).where(User.id == bindparam("id"))
+
+
+def _store(user_id: int, username: str, password_hash: str) -> Tuple[str, str, float]:
+    if len(_entries) >= _MAX_ENTRIES:
+        _entries.clear()
+    entry = (User.fingerprint_for(password_hash), username, time.monotonic() + _TTL)
+    _entries[user_id] = entry
+    return entry
+
+
+def forget(user_id: int) -> None:
+    _entries.pop(user_id, None)
+
+
+def load(token: str) -> User | None:
+    """Resolve a session token (``"<id>:<fingerprint>"``) to a session-bound User."""
+    ident, _, fingerprint = token.partition(":")
+    user_id = int(ident)
+
+    entry = _entries.get(user_id)
+    if entry is None or entry[0] != fingerprint or entry[2] <= time.monotonic():
+        row = db.session.execute(_USER_ROW, {"id": user_id}).first()
+        if row is None:
+            forget(user_id)
+            return None
+        entry = _store(user_id, row.username, row.password_hash)
+        if entry[0] != fingerprint:
+            return None
+
+    # password_hash is left unloaded, so make_transient_to_detached marks it
+    # expired and any access loads it from the database, never from the cache
+    user = User(id=user_id, username=entry[1])
+    make_transient_to_detached(user)
+    # Attach without a SELECT; later writes (password change, delete) still flush
+    return db.session.merge(user, load=False)
@@ -0,0 +1,17 @@
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "app.db"
+
+
+@pytest.fixture
+def app(db_path):
+    return create_app({
+        "SECRET_KEY": "test-secret",
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "TESTING": True,
+    })
@@ -0,0 +1,69 @@
+import sqlite3
+
+from sqlalchemy import Integer, inspect, select
+
+from app.db import db
+from app.models import EVENT_CODES, PB, Event
+
+
+def _init_db(app):
+    result = app.test_cli_runner().invoke(args=["init-db"])
+    assert result.exception is None, result.output
+    return result.output
+
+
+def _make_legacy_pbs(db_path):
+    """Recreate pbs in the layout that stored event names as strings."""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        """
+        INSERT INTO users (id, username, password_hash) VALUES (1, 'u', 'x');
+        INSERT INTO swimmers (id, name, gender, active, owner_id) VALUES (1, 's', 'm', 1, 1);
+        DROP TABLE pbs;
+        CREATE TABLE pbs (
+            id INTEGER PRIMARY KEY,
+            swimmer_id INTEGER NOT NULL REFERENCES swimmers (id) ON DELETE CASCADE,
+            event VARCHAR(7) NOT NULL,
+            points INTEGER NOT NULL,
+            time_seconds FLOAT
+        );
+        INSERT INTO pbs VALUES (1, 1, 'IM_400', 500, 300.0), (2, 1, 'FR_50', 600, 25.0);
+        """
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_init_db_converts_legacy_event_names(app, db_path):
+    _init_db(app)
+    _make_legacy_pbs(db_path)
+
+    assert "Converted personal best events" in _init_db(app)
+
+    with app.app_context():
+        columns = {col["name"]: col["type"] for col in inspect(db.engine).get_columns("pbs")}
+        assert isinstance(columns["event"], Integer)
+        with db.engine.connect() as conn:
+            raw = dict(conn.exec_driver_sql("SELECT id, event FROM pbs").all())
+        assert raw == {1: EVENT_CODES[Event.IM_400], 2: EVENT_CODES[Event.FR_50]}
+        pbs = db.session.scalars(select(PB).order_by(PB.id)).all()
+        assert [(pb.event, pb.points, pb.time_seconds) for pb in pbs] == [
+            (Event.IM_400, 500, 300.0),
+            (Event.FR_50, 600, 25.0),
+        ]
+
+
+def test_init_db_second_run_is_a_no_op(app, db_path):
+    _init_db(app)
+    _make_legacy_pbs(db_path)
+    _init_db(app)
+
+    with sqlite3.connect(db_path) as conn:
+        before = conn.execute("SELECT * FROM pbs ORDER BY id").fetchall()
+        schema_before = conn.execute("SELECT sql FROM sqlite_master WHERE tbl_name = 'pbs'").fetchall()
+
+    assert "Converted" not in _init_db(app)
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT * FROM pbs ORDER BY id").fetchall() == before
+        assert conn.execute("SELECT sql FROM sqlite_master WHERE tbl_name = 'pbs'").fetchall() == schema_before
@@ -0,0 +1,35 @@
+import pytest
+
+from app.routes.swimmers import format_seconds_to_time, parse_time_to_seconds
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["0.05", "25.31", "59.99", "1:00.00", "1:05.20", "10:00.00", "16:42.07"],
+)
+def test_canonical_times_round_trip(text):
+    assert format_seconds_to_time(parse_time_to_seconds(text)) == text
+
+
+def test_every_hundredth_round_trips():
+    for hundredths in range(0, 20 * 6000):
+        text = format_seconds_to_time(hundredths / 100)
+        assert round(parse_time_to_seconds(text) * 100) == hundredths
+
+
+@pytest.mark.parametrize("value", [None, "", "   "])
+def test_blank_input_is_none(value):
+    assert parse_time_to_seconds(value) is None
+
+
+def test_surrounding_whitespace_is_ignored():
+    assert parse_time_to_seconds(" 1:05.20 ") == pytest.approx(65.2)
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["abc", "25", "25.3", "25.311", "1:5.20", "1:60.00", ":25.31", "1:", "-1.00", "1:2:03.00"],
+)
+def test_malformed_times_are_rejected(value):
+    with pytest.raises(ValueError):
+        parse_time_to_seconds(value)